@@ -1,4 +1,6 @@
 """This module contains configuration constants used across the framework"""
+from datetime import timedelta
+
 from itk_dev_shared_components.kmd_nova.nova_objects import Caseworker, Department
 
 # The number of times the robot retries on an error before terminating.
@@ -18,6 +20,8 @@ EFLYT_LOGIN = "Eflyt"
 KEYVAULT_CREDENTIALS = "Keyvault"
 KEYVAULT_URI = "Keyvault URI"
 NOVA_API = "Nova API"
+NEXT_TRIGGER_INTERVAL = "Godkendelsesbreve næste kørsel"
+DEFERRED_FROM_DATE = "Godkendelsesbreve udskudte sager"
 
 KEYVAULT_PATH = "Godkendelsesbreve_i_eFlyt"
 
@@ -25,6 +29,19 @@ QUEUE_NAME = "Udsendelse af orienteringsbrev om godkendelse af flyttesager"
 
 NOTE_TEXT = "Godkendelsesbrev sendt"
 
+# eFlyt search config
+SEARCH_WINDOW = timedelta(days=5)
+
+# Run planning config
+RUN_TIME_BUDGET = timedelta(minutes=45)
+DEFAULT_CASE_DURATION = timedelta(seconds=60)
+CASE_DURATION_SAMPLE_SIZE = 50
+CASE_DURATION_WINDOW = timedelta(days=7)
+CASE_DURATION_QUERY_LIMIT = 1000
+CASE_LOG_DURATION = timedelta(seconds=10)
+MIN_TRIGGER_INTERVAL = timedelta(minutes=15)
+MAX_TRIGGER_INTERVAL = timedelta(hours=4)
+
 # Nova config
 CASEWORKER = Caseworker(
         name='Rpabruger Rpa78 - MÅ IKKE SLETTES RITM0283472',
@@ -0,0 +1,166 @@
+"""This module contains functions for planning a run of the robot within a time budget."""
+
+from dataclasses import dataclass
+from datetime import date, datetime, timedelta
+import statistics
+
+from OpenOrchestrator.orchestrator_connection.connection import OrchestratorConnection
+from OpenOrchestrator.database.queues import QueueStatus
+from itk_dev_shared_components.eflyt.eflyt_case import Case
+
+from robot_framework import config
+
+
+@dataclass
+class RunPlan:
+    """A plan for a single run of the robot."""
+    deadline: datetime
+    case_duration: timedelta
+
+    def has_time_for_case(self) -> bool:
+        """Check if there is time left in the budget to handle one more case.
+
+        Returns:
+            True if another case is expected to finish before the deadline.
+        """
+        return datetime.now() + self.case_duration <= self.deadline
+
+
+def create_plan(start_time: datetime, orchestrator_connection: OrchestratorConnection) -> RunPlan:
+    """Create a plan for the current run based on the time budget
+    and the historical time spent per case.
+
+    Args:
+        start_time: The time the run started.
+        orchestrator_connection: The connection to Orchestrator.
+
+    Returns:
+        A RunPlan for the current run.
+    """
+    case_duration = estimate_case_duration(orchestrator_connection)
+    orchestrator_connection.log_info(f"Estimated time per case: {case_duration.total_seconds():.0f} seconds")
+    return RunPlan(deadline=start_time + config.RUN_TIME_BUDGET, case_duration=case_duration)
+
+
+def estimate_case_duration(orchestrator_connection: OrchestratorConnection) -> timedelta:
+    """Estimate the time it takes to handle a case using the
+    median duration of the most recently sent letters in the job queue.
+    The queue element is marked as done before the case log is written in eFlyt,
+    so a fixed allowance is added to cover the case log.
+
+    Args:
+        orchestrator_connection: The connection to Orchestrator.
+
+    Returns:
+        The estimated time per case.
+    """
+    # Queue elements are returned oldest first, so the recent window is fetched and the newest are taken from the end
+    from_date = datetime.now() - config.CASE_DURATION_WINDOW
+    queue_elements = orchestrator_connection.get_queue_elements(queue_name=config.QUEUE_NAME, status=QueueStatus.DONE, from_date=from_date, limit=config.CASE_DURATION_QUERY_LIMIT)
+
+    # Only count cases where a letter was sent, skipped cases finish much faster
+    durations = [
+        (element.end_date - element.start_date).total_seconds()
+        for element in queue_elements
+        if element.message == "Brev sendt" and element.start_date and element.end_date
+    ]
+    durations = durations[-config.CASE_DURATION_SAMPLE_SIZE:]
+
+    if not durations:
+        return config.DEFAULT_CASE_DURATION
+
+    return timedelta(seconds=statistics.median(durations)) + config.CASE_LOG_DURATION
+
+
+def order_cases(cases: list[Case]) -> list[Case]:
+    """Order cases so the cases with the earliest deadline are handled first.
+    Cases without a deadline are handled last, and ties are ordered by case number.
+
+    Args:
+        cases: The cases to order.
+
+    Returns:
+        A new list of the cases ordered by deadline.
+    """
+    return sorted(cases, key=lambda case: (case.deadline is None, case.deadline or datetime.max, case.case_number))
+
+
+def get_deferred_from_date(orchestrator_connection: OrchestratorConnection) -> date | None:
+    """Get the start of the search window from the last run that left cases over.
+
+    Args:
+        orchestrator_connection: The connection to Orchestrator.
+
+    Returns:
+        The start date of the search that left cases over, or None if no cases are waiting
+        or the constant doesn't exist.
+    """
+    try:
+        value = orchestrator_connection.get_constant(config.DEFERRED_FROM_DATE).value
+        return date.fromisoformat(value)
+    except ValueError:
+        return None
+
+
+def publish_deferred_from_date(from_date: date | None, orchestrator_connection: OrchestratorConnection) -> None:
+    """Save the start of the search window to the constant in Orchestrator,
+    so the next run can search far enough back to find the cases left over.
+    A missing constant is logged but doesn't stop the robot.
+
+    Args:
+        from_date: The start date of the search that left cases over, or None if no cases were left over.
+        orchestrator_connection: The connection to Orchestrator.
+    """
+    value = from_date.isoformat() if from_date else ""
+
+    try:
+        orchestrator_connection.update_constant(config.DEFERRED_FROM_DATE, value)
+    except ValueError as error:
+        orchestrator_connection.log_error(f"Unable to save the search window of left over cases: {error}")
+
+
+def recommend_interval(case_count: int, remaining_count: int, case_duration: timedelta) -> timedelta:
+    """Recommend the time until the next run based on the load of the current run.
+    If cases were left over the next run should start as soon as possible.
+    Otherwise the interval scales from the maximum interval on an empty queue
+    down to the minimum interval when the queue fills the entire time budget.
+
+    Args:
+        case_count: The number of cases found in this run.
+        remaining_count: The number of cases left over when the time budget ran out.
+        case_duration: The estimated time per case.
+
+    Returns:
+        The recommended time until the next run.
+    """
+    if remaining_count > 0:
+        return config.MIN_TRIGGER_INTERVAL
+
+    load = min((case_count * case_duration) / config.RUN_TIME_BUDGET, 1)
+    interval = config.MAX_TRIGGER_INTERVAL - (config.MAX_TRIGGER_INTERVAL - config.MIN_TRIGGER_INTERVAL) * load
+
+    return max(interval, config.MIN_TRIGGER_INTERVAL)
+
+
+def publish_interval(interval: timedelta, orchestrator_connection: OrchestratorConnection) -> None:
+    """Publish the recommended interval in whole minutes to the constant in Orchestrator.
+
+    Args:
+        interval: The recommended time until the next run.
+        orchestrator_connection: The connection to Orchestrator.
+    """
+    minutes = to_minutes(interval)
+    orchestrator_connection.log_info(f"Recommended time until next run: {minutes} minutes")
+    orchestrator_connection.update_constant(config.NEXT_TRIGGER_INTERVAL, str(minutes))
+
+
+def to_minutes(interval: timedelta) -> int:
+    """Convert an interval to whole minutes.
+
+    Args:
+        interval: The interval to convert.
+
+    Returns:
+        The interval rounded to whole minutes.
+    """
+    return round(interval.total_seconds() / 60)
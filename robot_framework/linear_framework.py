@@ -4,6 +4,7 @@
 # pylint: disable=duplicate-code
 
 import sys
+from datetime import datetime
 
 from OpenOrchestrator.orchestrator_connection.connection import OrchestratorConnection
 
@@ -22,11 +23,14 @@ def main():
     orchestrator_connection.log_trace("Robot Framework started.")
     initialize.initialize(orchestrator_connection)
 
+    # The time budget covers all retries, so the start time is only taken once
+    start_time = datetime.now()
+
     error_count = 0
     for _ in range(config.MAX_RETRY_COUNT):
         try:
             reset.reset(orchestrator_connection)
-            process.process(orchestrator_connection)
+            process.process(orchestrator_connection, start_time)
             break
 
         # If any business rules are broken the robot should stop entirely.
@@ -21,19 +21,51 @@ from python_serviceplatformen.authentication import KombitAccess
 import hvac
 
 from robot_framework import config
-from robot_framework.custom import nova
+from robot_framework.custom import nova, run_planner
 
 
-def process(orchestrator_connection: OrchestratorConnection) -> None:
-    """Do the primary process of the robot."""
+def process(orchestrator_connection: OrchestratorConnection, start_time: datetime) -> None:
+    """Do the primary process of the robot.
+
+    Args:
+        orchestrator_connection: The connection to Orchestrator.
+        start_time: The time the robot started. Shared between retries so they use the same time budget.
+    """
     orchestrator_connection.log_trace("Running process.")
 
-    kombit_access = create_kombit_access(orchestrator_connection)
+    # If the process fails the cases are still waiting, so the next run should start soon
+    interval = config.MIN_TRIGGER_INTERVAL
+    try:
+        interval = handle_cases(orchestrator_connection, start_time)
+    finally:
+        # An error while publishing must not hide an error from the process
+        try:
+            run_planner.publish_interval(interval, orchestrator_connection)
+        # pylint: disable-next = broad-exception-caught
+        except Exception as error:
+            orchestrator_connection.log_error(f"Unable to publish the recommended interval: {repr(error)}")
+
+
+def handle_cases(orchestrator_connection: OrchestratorConnection, start_time: datetime) -> timedelta:
+    """Find and handle as many cases as the time budget allows.
+
+    Args:
+        orchestrator_connection: The connection to Orchestrator.
+        start_time: The time the robot started.
 
+    Returns:
+        The recommended time until the next run.
+    """
     eflyt_creds = orchestrator_connection.get_credential(config.EFLYT_LOGIN)
     browser = eflyt_login.login(eflyt_creds.username, eflyt_creds.password)
 
-    from_date = (datetime.now()-timedelta(days=5)).date()
+    from_date = (datetime.now()-config.SEARCH_WINDOW).date()
+
+    # Search further back if cases were left over last time, so they don't fall out of the search
+    deferred_from_date = run_planner.get_deferred_from_date(orchestrator_connection)
+    if deferred_from_date and deferred_from_date < from_date:
+        orchestrator_connection.log_info(f"Cases were left over in an earlier run. Searching from {deferred_from_date}.")
+        from_date = deferred_from_date
     to_date = datetime.today().date()
 
     eflyt_search.search(browser, from_date=from_date, to_date=to_date, case_state="Afsluttet", case_status="Godkendt")
@@ -41,13 +73,26 @@ def process(orchestrator_connection: OrchestratorConnection) -> None:
     orchestrator_connection.log_info(f"Total cases found: {len(cases)}")
     cases = filter_cases(cases)
     orchestrator_connection.log_info(f"Relevant cases found: {len(cases)}")
+    cases = run_planner.order_cases([case for case in cases if check_queue(case.case_number, orchestrator_connection)])
+    orchestrator_connection.log_info(f"Unhandled cases found: {len(cases)}")
+
+    if not cases:
+        run_planner.publish_deferred_from_date(None, orchestrator_connection)
+        return run_planner.recommend_interval(0, 0, timedelta(0))
+
+    plan = run_planner.create_plan(start_time, orchestrator_connection)
+
+    kombit_access = create_kombit_access(orchestrator_connection)
 
     nova_credentials = orchestrator_connection.get_credential(config.NOVA_API)
     nova_access = NovaAccess(nova_credentials.username, nova_credentials.password)
 
+    handled_count = 0
     for case in cases:
-        if not check_queue(case.case_number, orchestrator_connection):
-            continue
+        if not plan.has_time_for_case():
+            deferred_cases = [deferred_case.case_number for deferred_case in cases[handled_count:]]
+            orchestrator_connection.log_info(f"Time budget reached. Deferring {len(deferred_cases)} cases to the next run: {', '.join(deferred_cases)}")
+            break
 
         queue_element = orchestrator_connection.create_queue_element(config.QUEUE_NAME, case.case_number)
         orchestrator_connection.set_queue_element_status(queue_element.id, QueueStatus.IN_PROGRESS)
@@ -56,6 +101,7 @@ def process(orchestrator_connection: OrchestratorConnection) -> None:
 
         if not check_case_log(browser):
             orchestrator_connection.set_queue_element_status(queue_element.id, QueueStatus.DONE, "Springer over: Sagslog.")
+            handled_count += 1
             continue
 
         # Find data for letter
@@ -77,6 +123,12 @@ def process(orchestrator_connection: OrchestratorConnection) -> None:
         orchestrator_connection.set_queue_element_status(queue_element.id, QueueStatus.DONE, "Brev sendt")
 
         add_case_log(browser)
+        handled_count += 1
+
+    remaining_count = len(cases) - handled_count
+    run_planner.publish_deferred_from_date(from_date if remaining_count > 0 else None, orchestrator_connection)
+
+    return run_planner.recommend_interval(len(cases), remaining_count, plan.case_duration)
 
 
 def filter_cases(cases: list[Case]) -> list[Case]: